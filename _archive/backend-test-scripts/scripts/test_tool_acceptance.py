@@ -2,15 +2,33 @@
 Test Tool Acceptance Criteria
 Tests the AI Architect bot's tool usage, accuracy, and conversational quality.
 """
-import sys
+import argparse
+import asyncio
 import json
-import requests
-from typing import Dict, Any, List
+import queue
+import re
+import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple, Pattern, Callable
+
+import httpx
 
 # Configuration
 BACKEND_URL = "http://localhost:8000"
 API_ENDPOINT = f"{BACKEND_URL}/api/v1/chat/message"
+DEFAULT_CONCURRENCY = 8  # Max test messages in flight at once
+DEFAULT_RPS = 2.0  # Max new requests per second (protects the LLM provider)
+
+# Retry / timeout policy for test messages
+CONNECT_TIMEOUT = 5.0  # Seconds to establish a connection
+READ_TIMEOUT = 60.0  # Upper bound for waiting on a response
+MIN_READ_TIMEOUT = 15.0  # Adaptive timeout never drops below this
+MAX_RETRIES = 3  # Retries after the first attempt
+BACKOFF_FACTOR = 0.5  # Sleep 0.5s, 1s, 2s between attempts
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 # Test scenarios
 TEST_CASES = [
@@ -113,6 +131,102 @@ TEST_CASES = [
     },
 ]
 
+# Log lines are handed to one writer thread instead of printed inline
+LOG_QUEUE: "queue.Queue[Optional[str]]" = queue.Queue()
+_log_thread: Optional[threading.Thread] = None
+
+
+def log(message: str = ""):
+    """Queue a line of output for the background writer."""
+    LOG_QUEUE.put(message + "\n")
+
+
+def _log_writer():
+    """Drain everything queued so far and write it to stdout in one call."""
+    while True:
+        batch = [LOG_QUEUE.get()]
+        try:
+            while True:
+                batch.append(LOG_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+        sys.stdout.write("".join(m for m in batch if m is not None))
+        sys.stdout.flush()
+        if None in batch:
+            return
+
+
+def start_log_writer():
+    global _log_thread
+    _log_thread = threading.Thread(target=_log_writer, name="log-writer", daemon=True)
+    _log_thread.start()
+
+
+def stop_log_writer():
+    """Flush pending output and stop the writer thread."""
+    if _log_thread is not None:
+        LOG_QUEUE.put(None)
+        _log_thread.join()
+
+
+# Response keywords that suggest a given tool was used
+TOOL_KEYWORDS = {
+    "search_compute_instances": ('instance', 'gpu', 'cpu', 'vcpu', 'ram', 'price', 'provider'),
+    "search_k8s_packages": ('helm', 'chart', 'package', 'kubernetes', 'k8s', 'bitnami', 'prometheus', 'grafana', 'ingress'),
+    "search_hf_models": ('model', 'hugging', 'llama', 'mistral', 'downloads', 'likes', 'license'),
+}
+
+# Narrower keywords used as evidence in multi-tool tests
+MULTI_TOOL_KEYWORDS = {
+    "search_hf_models": ('model', 'hugging', 'llama'),
+    "search_compute_instances": ('instance', 'gpu', 'price'),
+}
+
+
+def _keyword_re(keywords: Tuple[str, ...]) -> Pattern:
+    """One alternation pattern so a response is scanned once, not once per keyword."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+TOOL_KEYWORD_RES = {tool: _keyword_re(kws) for tool, kws in TOOL_KEYWORDS.items()}
+MULTI_TOOL_KEYWORD_RES = {tool: _keyword_re(kws) for tool, kws in MULTI_TOOL_KEYWORDS.items()}
+
+# GPU hints; leading \b only so "gpus" and "gpu-enabled" still count
+GPU_HINT_RE = re.compile(r'\b(?:a100|h100|t4|l4|gpu|vram)')
+GPU_EMPHASIS_RE = re.compile(r'\b(?:a100|h100)|need.*gpu')
+TOOL_LANGUAGE_RE = _keyword_re(('found', 'results', 'instances', 'packages', 'models'))
+
+
+class ToolTestCase(NamedTuple):
+    """Test case with defaults and keyword set resolved once at import time."""
+    id: str
+    category: str
+    query: str
+    description: str
+    expected_tool: Optional[str]
+    expected_tools: Tuple[str, ...]
+    expected_params: Dict[str, Any]
+    expected_in_query: Optional[str]
+    kw_re: Optional[Pattern]
+
+
+def _compile_test_case(test_case: Dict[str, Any]) -> ToolTestCase:
+    expected_tool = test_case.get("expected_tool")
+    return ToolTestCase(
+        id=test_case["id"],
+        category=test_case["category"],
+        query=test_case["query"],
+        description=test_case["description"],
+        expected_tool=expected_tool,
+        expected_tools=tuple(test_case.get("expected_tools", ())),
+        expected_params=test_case.get("expected_params", {}),
+        expected_in_query=test_case.get("expected_in_query"),
+        kw_re=TOOL_KEYWORD_RES.get(expected_tool),
+    )
+
+
+TEST_CASES_COMPILED = tuple(_compile_test_case(tc) for tc in TEST_CASES)
+
 
 class TestResults:
     def __init__(self):
@@ -133,30 +247,84 @@ class TestResults:
         self.warnings.append({"id": test_id, "message": message})
         
     def print_summary(self):
-        print("\n" + "="*80)
-        print("TEST SUMMARY")
-        print("="*80)
-        print(f"\n✅ PASSED: {len(self.passed)}/{self.total}")
+        log("\n" + "="*80)
+        log("TEST SUMMARY")
+        log("="*80)
+        log(f"\n✅ PASSED: {len(self.passed)}/{self.total}")
         for test in self.passed:
-            print(f"   {test['id']}: {test['message']}")
+            log(f"   {test['id']}: {test['message']}")
             
         if self.failed:
-            print(f"\n❌ FAILED: {len(self.failed)}/{self.total}")
+            log(f"\n❌ FAILED: {len(self.failed)}/{self.total}")
             for test in self.failed:
-                print(f"   {test['id']}: {test['message']}")
+                log(f"   {test['id']}: {test['message']}")
                 
         if self.warnings:
-            print(f"\n⚠️  WARNINGS: {len(self.warnings)}")
+            log(f"\n⚠️  WARNINGS: {len(self.warnings)}")
             for warning in self.warnings:
-                print(f"   {warning['id']}: {warning['message']}")
+                log(f"   {warning['id']}: {warning['message']}")
                 
         pass_rate = (len(self.passed) / self.total * 100) if self.total > 0 else 0
-        print(f"\n📊 Pass Rate: {pass_rate:.1f}%")
-        print("="*80 + "\n")
+        log(f"\n📊 Pass Rate: {pass_rate:.1f}%")
+        log("="*80 + "\n")
+
+
+class RateLimiter:
+    """Spaces out request starts so at most `rps` requests begin per second."""
+    
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+        
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class LatencyTracker:
+    """Keeps recent successful latencies and derives a read timeout of 2x p95."""
+    
+    def __init__(self, window: int = 10):
+        self.samples = deque(maxlen=window)
+        
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        
+    def read_timeout(self) -> float:
+        if len(self.samples) < self.samples.maxlen:
+            return READ_TIMEOUT
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return min(READ_TIMEOUT, max(MIN_READ_TIMEOUT, 2 * p95))
+
 
+LATENCIES = LatencyTracker()
 
-def send_test_message(conversation_id: str, message: str, auth_token: str = None) -> Dict[str, Any]:
-    """Send a test message to the chatbot."""
+
+async def send_test_message(
+    client: httpx.AsyncClient,
+    conversation_id: str,
+    message: str,
+    auth_token: str = None,
+    out: Callable[[str], None] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Send a test message to the chatbot.
+    
+    Retries connection errors, timeouts and RETRY_STATUSES with exponential
+    backoff. The read timeout adapts to recent latencies; after any timeout
+    (connect or read) the next attempt falls back to the full READ_TIMEOUT.
+    Messages go to `out` (defaults to log) so callers can keep them with
+    the rest of a test case's output.
+    """
+    out = out or log
     headers = {"Content-Type": "application/json"}
     if auth_token:
         headers["Authorization"] = f"Bearer {auth_token}"
@@ -166,13 +334,40 @@ def send_test_message(conversation_id: str, message: str, auth_token: str = None
         "message": message
     }
     
-    try:
-        response = requests.post(API_ENDPOINT, json=payload, headers=headers, timeout=120)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
-        return None
+    read_timeout = LATENCIES.read_timeout()
+    for attempt in range(MAX_RETRIES + 1):
+        timeout = httpx.Timeout(read_timeout, connect=CONNECT_TIMEOUT)
+        started = time.monotonic()
+        try:
+            response = await client.post(API_ENDPOINT, json=payload, headers=headers, timeout=timeout)
+            if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                out(f"⚠️  Got {response.status_code}, retrying ({attempt + 1}/{MAX_RETRIES})")
+            else:
+                response.raise_for_status()
+                LATENCIES.record(time.monotonic() - started)
+                return response.json()
+        except httpx.TimeoutException as e:
+            if attempt == MAX_RETRIES:
+                out(f"❌ Request failed: {e!r}")
+                return None
+            out(f"⚠️  {e!r}, retrying ({attempt + 1}/{MAX_RETRIES})")
+            read_timeout = READ_TIMEOUT
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES:
+                out(f"❌ Request failed: {e}")
+                return None
+            out(f"⚠️  {e}, retrying ({attempt + 1}/{MAX_RETRIES})")
+        except httpx.HTTPError as e:
+            out(f"❌ Request failed: {e}")
+            return None
+        except ValueError as e:
+            # 200 response whose body is not valid JSON
+            out(f"❌ Invalid JSON response: {e}")
+            return None
+        
+        await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+    
+    return None
 
 
 def extract_tool_calls_from_response(response_text: str) -> List[Dict[str, Any]]:
@@ -210,57 +405,81 @@ def extract_tool_calls_from_response(response_text: str) -> List[Dict[str, Any]]
     return tool_calls
 
 
-def run_test_case(test_case: Dict[str, Any], conversation_id: str, results: TestResults):
-    """Run a single test case."""
-    test_id = test_case["id"]
-    print(f"\n{'='*80}")
-    print(f"Running Test: {test_id}")
-    print(f"Category: {test_case['category']}")
-    print(f"Query: {test_case['query']}")
-    print(f"Expected: {test_case['description']}")
-    print(f"{'='*80}")
+async def run_test_case(
+    tc: ToolTestCase,
+    conversation_id: str,
+    results: TestResults,
+    client: httpx.AsyncClient,
+    progress: str = ""
+):
+    """
+    Run a single test case.
+    
+    Output is collected and logged as one block when the case finishes, so
+    concurrent cases don't interleave their lines.
+    """
+    lines = [progress] if progress else []
+    try:
+        await _check_test_case(tc, conversation_id, results, client, lines.append)
+    finally:
+        log("\n".join(lines))
+
+
+async def _check_test_case(
+    tc: ToolTestCase,
+    conversation_id: str,
+    results: TestResults,
+    client: httpx.AsyncClient,
+    out: Callable[[str], None]
+):
+    """Send the test query and grade the response, writing output to `out`."""
+    test_id = tc.id
+    out(f"\n{'='*80}")
+    out(f"Running Test: {test_id}")
+    out(f"Category: {tc.category}")
+    out(f"Query: {tc.query}")
+    out(f"Expected: {tc.description}")
+    out(f"{'='*80}")
     
     # Send the message
-    response = send_test_message(conversation_id, test_case["query"])
+    response = await send_test_message(client, conversation_id, tc.query, out=out)
     
     if not response:
         results.add_fail(test_id, "Failed to get response from backend")
         return
     
     response_text = response.get("response", "")
-    print(f"\n📝 Response Preview: {response_text[:200]}...")
+    text_lower = response_text.lower()
+    out(f"\n📝 Response Preview: {response_text[:200]}...")
     
     # Extract tool calls (this is a simplified version - in real implementation,
     # you'd need to capture the actual tool calls from logs or add instrumentation)
     # For now, we'll do basic text analysis
     
     # Check if expected tool was called (basic heuristic)
-    expected_tool = test_case.get("expected_tool")
-    expected_tools = test_case.get("expected_tools", [])
+    expected_tool = tc.expected_tool
+    expected_tools = tc.expected_tools
     
     if expected_tool:
         # Simple check: look for tool mentions or related keywords
-        tool_name_lower = expected_tool.lower()
-        
         if expected_tool == "search_compute_instances":
             # Check for compute-related responses
-            has_compute_keywords = any(kw in response_text.lower() for kw in 
-                ['instance', 'gpu', 'cpu', 'vcpu', 'ram', 'price', 'provider'])
+            has_compute_keywords = tc.kw_re.search(text_lower) is not None
             
             if has_compute_keywords:
                 results.add_pass(test_id, "Appears to use compute tool (keywords found)")
                 
                 # Check specific parameters if expected
-                expected_params = test_case.get("expected_params", {})
+                expected_params = tc.expected_params
                 if "gpu_needed" in expected_params:
                     if expected_params["gpu_needed"] == True:
-                        if any(kw in response_text.lower() for kw in ['a100', 'h100', 't4', 'l4', 'gpu', 'vram']):
-                            print("   ✅ GPU-related content found")
+                        if GPU_HINT_RE.search(text_lower) is not None:
+                            out("   ✅ GPU-related content found")
                         else:
                             results.add_warning(test_id, "Expected GPU content, but not clearly present")
                     elif expected_params["gpu_needed"] == False:
-                        if 'cpu' in response_text.lower() and not any(kw in response_text.lower() for kw in ['a100', 'h100', 'need.*gpu']):
-                            print("   ✅ CPU-focused content (GPU not emphasized)")
+                        if 'cpu' in text_lower and GPU_EMPHASIS_RE.search(text_lower) is None:
+                            out("   ✅ CPU-focused content (GPU not emphasized)")
                         else:
                             results.add_warning(test_id, "Expected CPU focus, but response may mention GPUs")
             else:
@@ -268,8 +487,7 @@ def run_test_case(test_case: Dict[str, Any], conversation_id: str, results: Test
                 
         elif expected_tool == "search_k8s_packages":
             # Check for K8s-related responses
-            has_k8s_keywords = any(kw in response_text.lower() for kw in 
-                ['helm', 'chart', 'package', 'kubernetes', 'k8s', 'bitnami', 'prometheus', 'grafana', 'ingress'])
+            has_k8s_keywords = tc.kw_re.search(text_lower) is not None
             
             if has_k8s_keywords:
                 results.add_pass(test_id, "Appears to use K8s tool (keywords found)")
@@ -278,54 +496,90 @@ def run_test_case(test_case: Dict[str, Any], conversation_id: str, results: Test
                 
         elif expected_tool == "search_hf_models":
             # Check for HF-related responses
-            has_hf_keywords = any(kw in response_text.lower() for kw in 
-                ['model', 'hugging', 'llama', 'mistral', 'downloads', 'likes', 'license'])
+            has_hf_keywords = tc.kw_re.search(text_lower) is not None
             
             if has_hf_keywords:
                 results.add_pass(test_id, "Appears to use HF tool (keywords found)")
             else:
                 results.add_fail(test_id, "No HuggingFace-related keywords found in response")
                 
+    elif expected_tools:
+        # Multi-tool test: stop scanning as soon as every expected tool has evidence
+        needed = set(expected_tools)
+        found = set()
+        for tool, keyword_re in MULTI_TOOL_KEYWORD_RES.items():
+            if tool in needed and keyword_re.search(text_lower) is not None:
+                found.add(tool)
+                if needed <= found:
+                    break
+            
+        if needed <= found:
+            results.add_pass(test_id, f"Multiple tools appear to be used: {sorted(found)}")
+        else:
+            results.add_fail(test_id, f"Expected {len(needed)} tools, found evidence of {len(found)}")
+    
     elif expected_tool is None:
         # Should NOT call tools
-        tool_keywords = ['found', 'results', 'instances', 'packages', 'models']
-        has_tool_language = sum(1 for kw in tool_keywords if kw in response_text.lower()) >= 2
+        has_tool_language = len(set(TOOL_LANGUAGE_RE.findall(text_lower))) >= 2
         
         if not has_tool_language:
             results.add_pass(test_id, "Correctly did not call tools (informational response)")
         else:
             results.add_warning(test_id, "May have called tools unnecessarily")
             
-    elif expected_tools:
-        # Multi-tool test
-        tools_found = []
-        if any(kw in response_text.lower() for kw in ['model', 'hugging', 'llama']):
-            tools_found.append("search_hf_models")
-        if any(kw in response_text.lower() for kw in ['instance', 'gpu', 'price']):
-            tools_found.append("search_compute_instances")
-            
-        if len(tools_found) >= len(expected_tools):
-            results.add_pass(test_id, f"Multiple tools appear to be used: {tools_found}")
-        else:
-            results.add_fail(test_id, f"Expected {len(expected_tools)} tools, found evidence of {len(tools_found)}")
+    out(f"\n{'='*80}\n")
+
+
+async def run_all(conversation_id: str, results: TestResults, concurrency: int, rps: float):
+    """Run all test cases concurrently with bounded in-flight requests and RPS."""
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rps)
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency)
     
-    print(f"\n{'='*80}\n")
+    async with httpx.AsyncClient(limits=limits) as client:
+        async def bounded(i: int, tc: ToolTestCase):
+            async with semaphore:
+                await limiter.wait()
+                # Each case gets its own conversation so concurrent runs don't share history
+                await run_test_case(tc, f"{conversation_id}_{tc.id}", results, client,
+                                    progress=f"\nProgress: {i}/{len(TEST_CASES)}")
+        
+        await asyncio.gather(*(bounded(i, tc) for i, tc in enumerate(TEST_CASES_COMPILED, 1)))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stack8s AI Architect tool acceptance tests")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Max concurrent test messages (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS,
+                        help=f"Max requests started per second, 0 = unlimited (default: {DEFAULT_RPS})")
+    return parser.parse_args()
 
 
 def main():
     """Run all test cases."""
-    print("\n" + "🧪"*40)
-    print("Stack8s AI Architect - Tool Acceptance Testing")
-    print("🧪"*40 + "\n")
+    args = parse_args()
+    start_log_writer()
+    try:
+        run_main(args)
+    finally:
+        stop_log_writer()
+
+
+def run_main(args: argparse.Namespace):
+    """Health check, run the suite, print the summary and exit."""
+    log("\n" + "🧪"*40)
+    log("Stack8s AI Architect - Tool Acceptance Testing")
+    log("🧪"*40 + "\n")
     
     # Check backend health
     try:
-        health_response = requests.get(f"{BACKEND_URL}/health", timeout=5)
+        health_response = httpx.get(f"{BACKEND_URL}/health", timeout=5)
         health_response.raise_for_status()
-        print("✅ Backend is healthy\n")
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Backend health check failed: {e}")
-        print("   Make sure the backend is running on http://localhost:8000")
+        log("✅ Backend is healthy\n")
+    except httpx.HTTPError as e:
+        log(f"❌ Backend health check failed: {e}")
+        log("   Make sure the backend is running on http://localhost:8000")
         sys.exit(1)
     
     # Create a test conversation
@@ -333,10 +587,8 @@ def main():
     
     results = TestResults()
     
-    # Run each test case
-    for i, test_case in enumerate(TEST_CASES, 1):
-        print(f"\nProgress: {i}/{len(TEST_CASES)}")
-        run_test_case(test_case, conversation_id, results)
+    # Run test cases concurrently
+    asyncio.run(run_all(conversation_id, results, max(1, args.concurrency), args.rps))
     
     # Print summary
     results.print_summary()
@@ -350,4 +602,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
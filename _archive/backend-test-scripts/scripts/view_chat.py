@@ -2,11 +2,36 @@
 
 Usage:
     python scripts/view_chat.py CONVERSATION_ID
+
+Responses are cached in ~/.ai_architect_etags/ and revalidated with
+If-None-Match, so unchanged conversations are not downloaded again.
 """
+import json
 import requests
 import sys
+from pathlib import Path
 
 BASE_URL = "http://localhost:8000/api/v1"
+CACHE_DIR = Path.home() / ".ai_architect_etags"
+
+
+def _load_cached(conversation_id):
+    """Return the cached {"etag", "body"} entry for a conversation, if any."""
+    try:
+        with open(CACHE_DIR / f"{conversation_id}.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached(conversation_id, etag, body):
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(CACHE_DIR / f"{conversation_id}.json", "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "body": body}, f)
+    except OSError:
+        pass  # Cache is best-effort
+
 
 def view_conversation(conversation_id):
     """View full conversation history."""
@@ -14,25 +39,36 @@ def view_conversation(conversation_id):
         sys.stdout.reconfigure(encoding='utf-8')
     
     try:
-        response = requests.get(f"{BASE_URL}/chat/{conversation_id}")
-        if response.status_code == 200:
+        cached = _load_cached(conversation_id)
+        headers = {"Accept-Encoding": "gzip"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        
+        response = requests.get(f"{BASE_URL}/chat/{conversation_id}", headers=headers)
+        if response.status_code == 304 and cached:
+            data = cached["body"]
+        elif response.status_code == 200:
             data = response.json()
-            
-            print("\n" + "=" * 80)
-            print(f"  CONVERSATION: {conversation_id}")
-            print("=" * 80 + "\n")
-            
-            for i, msg in enumerate(data['messages'], 1):
-                role = msg['role'].upper()
-                content = msg['content']
-                timestamp = msg['created_at']
-                
-                print(f"[{i}] {role} ({timestamp}):")
-                print("-" * 80)
-                print(content)
-                print("\n")
+            etag = response.headers.get("ETag")
+            if etag:
+                _store_cached(conversation_id, etag, data)
         else:
             print(f"Error: {response.text}")
+            return
+            
+        print("\n" + "=" * 80)
+        print(f"  CONVERSATION: {conversation_id}")
+        print("=" * 80 + "\n")
+        
+        for i, msg in enumerate(data['messages'], 1):
+            role = msg['role'].upper()
+            content = msg['content']
+            timestamp = msg['created_at']
+            
+            print(f"[{i}] {role} ({timestamp}):")
+            print("-" * 80)
+            print(content)
+            print("\n")
     except Exception as e:
         print(f"Error: {e}")
 
@@ -45,4 +81,3 @@ if __name__ == "__main__":
     
     conversation_id = sys.argv[1]
     view_conversation(conversation_id)
-
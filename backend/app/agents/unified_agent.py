@@ -10,8 +10,7 @@ Capabilities:
 import json
 import logging
 from typing import List, Dict, Any
-from openai import OpenAI
-from app.config import get_settings
+from app.config import get_settings, get_openai_client
 from app.constants import AgentConfig
 from app.tools.compute_tool import search_compute_instances
 from app.tools.hf_tool import search_hf_models
@@ -20,6 +19,7 @@ from app.tools.local_tool import check_local_cluster
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("agent")
+LOG_SEPARATOR = "=" * 80
 
 # Tool definitions
 ALL_TOOLS = [
@@ -140,72 +140,79 @@ def run_tool(tool_call, tool_map) -> Dict[str, Any]:
     name = tool_call.function.name
     args = json.loads(tool_call.function.arguments)
     
-    logger.info(f"\n{'='*80}")
-    logger.info(f"🛠️  [TOOL CALL] {name}")
-    logger.info(f"{'='*80}")
-    logger.info(f"📥 Arguments:")
+    logger.info("\n%s", LOG_SEPARATOR)
+    logger.info("🛠️  [TOOL CALL] %s", name)
+    logger.info("%s", LOG_SEPARATOR)
+    logger.info("📥 Arguments:")
     for key, value in args.items():
-        logger.info(f"   • {key}: {value}")
+        logger.info("   • %s: %s", key, value)
     
     if name in tool_map:
         try:
             result = tool_map[name](**args)
             
-            # Log detailed output
-            logger.info(f"\n📤 Tool Output:")
+            # Log detailed output (skip building previews entirely when INFO is off)
+            if logger.isEnabledFor(logging.INFO):
+                _log_tool_output(result)
             
-            if isinstance(result, dict):
-                # Log results count
-                if 'results' in result:
-                    logger.info(f"   ✓ Found {len(result['results'])} results")
-                    
-                    # Log first few results in detail
-                    for i, item in enumerate(result['results'][:3], 1):
-                        logger.info(f"\n   Result #{i}:")
-                        if isinstance(item, dict):
-                            for k, v in list(item.items())[:5]:  # First 5 fields
-                                if isinstance(v, (list, dict)):
-                                    logger.info(f"      {k}: {str(v)[:50]}...")
-                                else:
-                                    logger.info(f"      {k}: {v}")
-                        else:
-                            logger.info(f"      {str(item)[:100]}")
-                    
-                    if len(result['results']) > 3:
-                        logger.info(f"   ... and {len(result['results']) - 3} more results")
-                
-                # Log metadata
-                if 'metadata' in result:
-                    logger.info(f"\n   Metadata: {result['metadata']}")
-            else:
-                # For non-dict results, show preview
-                result_str = str(result)
-                if len(result_str) > 500:
-                    logger.info(f"   {result_str[:500]}...")
-                    logger.info(f"   ... ({len(result_str)} total chars)")
-                else:
-                    logger.info(f"   {result_str}")
-            
-            logger.info(f"\n✅ Tool execution completed successfully")
-            logger.info(f"{'='*80}\n")
+            logger.info("\n✅ Tool execution completed successfully")
+            logger.info("%s\n", LOG_SEPARATOR)
             
             return result
             
         except Exception as e:
-            logger.error(f"\n❌ Tool execution failed: {str(e)}")
-            logger.info(f"{'='*80}\n")
+            logger.error("\n❌ Tool execution failed: %s", e)
+            logger.info("%s\n", LOG_SEPARATOR)
             return {"error": f"Tool {name} failed: {str(e)}"}
     else:
-        logger.error(f"❌ Tool not found: {name}")
-        logger.info(f"{'='*80}\n")
+        logger.error("❌ Tool not found: %s", name)
+        logger.info("%s\n", LOG_SEPARATOR)
         return {"error": f"Tool {name} not found"}
 
+
+def _log_tool_output(result: Any) -> None:
+    """Log a short preview of a tool result."""
+    logger.info("\n📤 Tool Output:")
+    
+    if isinstance(result, dict):
+        # Log results count
+        if 'results' in result:
+            logger.info("   ✓ Found %d results", len(result['results']))
+            
+            # Log first few results in detail
+            for i, item in enumerate(result['results'][:3], 1):
+                logger.info("\n   Result #%d:", i)
+                if isinstance(item, dict):
+                    for k, v in list(item.items())[:5]:  # First 5 fields
+                        if isinstance(v, (list, dict)):
+                            logger.info("      %s: %s...", k, str(v)[:50])
+                        else:
+                            logger.info("      %s: %s", k, v)
+                else:
+                    logger.info("      %s", str(item)[:100])
+            
+            if len(result['results']) > 3:
+                logger.info("   ... and %d more results", len(result['results']) - 3)
+        
+        # Log metadata
+        if 'metadata' in result:
+            logger.info("\n   Metadata: %s", result['metadata'])
+    else:
+        # For non-dict results, show preview
+        result_str = str(result)
+        if len(result_str) > 500:
+            logger.info("   %s...", result_str[:500])
+            logger.info("   ... (%d total chars)", len(result_str))
+        else:
+            logger.info("   %s", result_str)
+
+
 def run_agent(conversation_history: List[Dict[str, str]]) -> str:
     """
     Run the unified agent with ReAct loop.
     Returns: User-friendly response (Markdown).
     """
-    client = OpenAI(api_key=get_settings().openai_api_key)
+    client = get_openai_client()
     model = get_settings().openai_chat_model
     
     tool_map = {
@@ -222,7 +229,7 @@ def run_agent(conversation_history: List[Dict[str, str]]) -> str:
     
     # ReAct Loop
     for iteration in range(AgentConfig.MAX_ITERATIONS):
-        logger.info(f"🔄 [ITERATION {iteration + 1}/{AgentConfig.MAX_ITERATIONS}]")
+        logger.info("🔄 [ITERATION %d/%d]", iteration + 1, AgentConfig.MAX_ITERATIONS)
         
         try:
             response = client.chat.completions.create(
@@ -237,11 +244,11 @@ def run_agent(conversation_history: List[Dict[str, str]]) -> str:
             
             # If no tool calls, return the response
             if not message.tool_calls:
-                logger.info(f"✅ [AGENT] Response ready ({len(message.content)} chars)")
+                logger.info("✅ [AGENT] Response ready (%d chars)", len(message.content))
                 return message.content
             
             # Log how many tools the agent wants to call
-            logger.info(f"   🤔 Agent wants to call {len(message.tool_calls)} tool(s)")
+            logger.info("   🤔 Agent wants to call %d tool(s)", len(message.tool_calls))
             
             # Add assistant message to history
             messages.append(message.model_dump(exclude_unset=True))
@@ -258,8 +265,8 @@ def run_agent(conversation_history: List[Dict[str, str]]) -> str:
                 })
                 
         except Exception as e:
-            logger.error(f"❌ [AGENT] Error: {e}")
+            logger.error("❌ [AGENT] Error: %s", e)
             return f"I encountered an error: {str(e)}. Please try again."
     
-    logger.warning(f"⚠️  [AGENT] Hit max iterations ({AgentConfig.MAX_ITERATIONS})")
+    logger.warning("⚠️  [AGENT] Hit max iterations (%d)", AgentConfig.MAX_ITERATIONS)
     return "I'm having trouble completing this request. Could you rephrase or simplify it?"
@@ -1,6 +1,7 @@
 """Configuration management for the backend API."""
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from openai import OpenAI
 
 
 class Settings(BaseSettings):
@@ -51,3 +52,13 @@ def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
 
+
+@lru_cache()
+def get_openai_client() -> OpenAI:
+    """
+    Get cached OpenAI client.
+    
+    A single client is shared so every request reuses its keep-alive
+    connection pool instead of opening a new TLS connection per call.
+    """
+    return OpenAI(api_key=get_settings().openai_api_key)
@@ -1,11 +1,13 @@
 """FastAPI API server (DB-backed chat memory with per-user ownership)."""
 
 from datetime import datetime
+import hashlib
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.agents.unified_agent import run_agent
 from app.auth import get_user_id, verify_conversation_access
@@ -50,6 +52,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress larger JSON payloads (e.g. long chat histories) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
 def _clean_for_llm(history: List[Dict[str, Any]]) -> List[Dict[str, str]]:
@@ -68,11 +72,10 @@ def _generate_conversation_title(user_message: str, assistant_response: str) ->
     Returns:
         A short title (3-6 words) describing the conversation topic
     """
-    from openai import OpenAI
-    from app.config import get_settings
+    from app.config import get_openai_client
     
     try:
-        client = OpenAI(api_key=get_settings().openai_api_key)
+        client = get_openai_client()
         
         prompt = f"""Based on this conversation, generate a very short, descriptive title (3-6 words max).
 
@@ -107,7 +110,7 @@ Title:"""
         return title if title else "New Conversation"
         
     except Exception as e:
-        logger.warning(f"Failed to generate title: {e}")
+        logger.warning("Failed to generate title: %s", e)
         # Fallback: use truncated user message
         max_fallback_length = 40
         if len(user_message) > max_fallback_length:
@@ -115,6 +118,27 @@ Title:"""
         return user_message
 
 
+def _history_etag(rows: List[Dict[str, Any]]) -> str:
+    """ETag for a conversation history (messages are append-only, so ids identify it)."""
+    digest = hashlib.sha256("|".join(r["id"] for r in rows).encode("utf-8")).hexdigest()
+    # Weak: GZipMiddleware may re-encode the body, so byte-for-byte equality isn't guaranteed
+    return f'W/"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header (a list of tags or "*") against etag."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == opaque:
+            return True
+    return False
+
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "version": "1.0.0", "ts": datetime.utcnow().isoformat()}
@@ -153,7 +177,7 @@ async def chat_message(request: ChatMessageRequest, user_id: str = Depends(get_u
     # Verify conversation access
     verify_conversation_access(request.conversation_id, user_id)
     
-    logger.info(f"📨 [INCOMING] user={user_id} conv={request.conversation_id} msg={request.message[:120]}")
+    logger.info("📨 [INCOMING] user=%s conv=%s msg=%s", user_id, request.conversation_id, request.message[:120])
 
     try:
         # Get message count before adding new message
@@ -171,9 +195,9 @@ async def chat_message(request: ChatMessageRequest, user_id: str = Depends(get_u
                 logger.info("🏷️  [TITLE] Generating conversation title...")
                 title = _generate_conversation_title(request.message, response_text)
                 update_conversation_title(request.conversation_id, title)
-                logger.info(f"🏷️  [TITLE] Generated: {title}")
+                logger.info("🏷️  [TITLE] Generated: %s", title)
             except Exception as title_error:
-                logger.warning(f"Failed to update title: {title_error}")
+                logger.warning("Failed to update title: %s", title_error)
 
         return ChatMessageResponse(
             conversation_id=request.conversation_id,
@@ -196,16 +220,24 @@ async def chat_message(request: ChatMessageRequest, user_id: str = Depends(get_u
         )
 
 @app.get("/api/v1/chat/{conversation_id}", response_model=ConversationHistoryResponse)
-async def get_history(conversation_id: str, user_id: str = Depends(get_user_id)):
+async def get_history(
+    conversation_id: str,
+    response: Response,
+    user_id: str = Depends(get_user_id),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+):
     """
     Get full conversation history with all messages.
     
     Args:
         conversation_id: UUID of the conversation
+        response: Outgoing response (used to set the ETag header)
         user_id: Authenticated user ID (from JWT token)
+        if_none_match: ETag from a previous response; unchanged history returns 304
         
     Returns:
-        ConversationHistoryResponse with all messages in chronological order
+        ConversationHistoryResponse with all messages in chronological order,
+        or an empty 304 response if the client's cached copy is current
         
     Raises:
         HTTPException: 404 if conversation not found, 403 if user doesn't own it
@@ -214,6 +246,10 @@ async def get_history(conversation_id: str, user_id: str = Depends(get_user_id))
     verify_conversation_access(conversation_id, user_id)
 
     rows = get_conversation_messages(conversation_id)
+    etag = _history_etag(rows)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return ConversationHistoryResponse(
         conversation_id=conversation_id,
         messages=[
@@ -2,11 +2,9 @@
 from typing import Dict, Any, List, Optional
 from app.db import execute_query
 from app.ranking import rank_hf_models
-from app.config import get_settings
-from openai import OpenAI
+from app.config import get_settings, get_openai_client
 
 settings = get_settings()
-openai_client = OpenAI(api_key=settings.openai_api_key)
 
 
 def get_query_embedding(text: str) -> List[float]:
@@ -19,7 +17,7 @@ def get_query_embedding(text: str) -> List[float]:
     Returns:
         List of floats representing the embedding vector
     """
-    response = openai_client.embeddings.create(
+    response = get_openai_client().embeddings.create(
         model=settings.openai_embed_model,
         input=text
     )